@@ -1,12 +1,19 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import requests
-import time
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from urllib.parse import urlencode
+import orjson
 import pandas as pd
 from datetime import datetime, date
+from functools import lru_cache
 import hashlib
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 import math
+import html
 from dataclasses import dataclass
 from enum import Enum
  
@@ -38,8 +45,23 @@ class SearchRule:
         # Remove empty parameters
         self.parameters = {k: v for k, v in self.parameters.items() if v is not None and v != ""}
 
+# === CONSTANTES ===
+UF_OPTIONS = ("", "AC", "AL", "AP", "AM", "BA", "CE", "DF", "ES", "GO", "MA", "MT", "MS", "MG", "PA", "PB",
+              "PR", "PE", "PI", "RJ", "RN", "RS", "RO", "RR", "SC", "SP", "SE", "TO")
+
+# Rótulos indexados por .value: a cada rerun os Enums são recriados, e o valor
+# guardado pelo widget pode ser um membro da classe da execução anterior
+_RULE_TYPE_LABELS = {"include": "Incluir", "exclude": "Excluir"}
+_RULE_OPERATOR_LABELS = {"or": "OU (união)", "and": "E (interseção)"}
+
+def _rule_type_fmt(x) -> str:
+    return _RULE_TYPE_LABELS.get(getattr(x, "value", x), str(x))
+
+def _rule_operator_fmt(x) -> str:
+    return _RULE_OPERATOR_LABELS.get(getattr(x, "value", x), str(x))
+
 # === ESTILO CSS ===
-st.markdown("""
+_CSS = """
 <style>
     .publication-card {
         border: 1px solid #ddd;
@@ -101,126 +123,224 @@ st.markdown("""
         background-color: #f8f9fa;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(_CSS, unsafe_allow_html=True)
+
+def _publication_key(pub: Dict, _get=dict.get) -> str:
+    """Chave usada para comparar publicações entre regras (hash, id ou conteúdo)"""
+    pub_hash = _get(pub, 'hash')
+    if pub_hash:
+        return str(pub_hash)
+    
+    # Para publicações sem hash, usar outros campos para identificar duplicatas;
+    # os prefixos evitam colisão com hashes reais
+    pub_id = _get(pub, 'id')
+    if pub_id is not None and pub_id != '':
+        return f"id:{pub_id}:{_get(pub, 'numeroprocessocommascara', '')}"
+    
+    # Sem hash nem id: só publicações idênticas compartilham a chave
+    return "raw:" + orjson.dumps(pub, option=orjson.OPT_SORT_KEYS).decode()
+
+def _index_publications(publications: List[Dict]) -> Dict[str, Dict]:
+    """Indexa publicações pela chave de comparação, mantendo a primeira ocorrência"""
+    by_key = {}
+    for pub in publications:
+        by_key.setdefault(_publication_key(pub), pub)
+    return by_key
+
+@st.cache_data(ttl=300, max_entries=512, show_spinner=False)
+def _fetch_page(_session: requests.Session, query_url: str, page: int) -> List[Dict]:
+    """Busca uma única página de resultados (cacheada entre reruns)"""
+    # Rate limit (429) e falhas transitórias são tratados pelo Retry da sessão
+    response = _session.get(f"{query_url}&pagina={page}", timeout=30)
+    
+    if response.status_code != 200:
+        raise requests.HTTPError(response=response)
+    
+    dados = orjson.loads(response.content)
+    return dados.get("items", [])
 
 class EnhancedDJESearcher:
     def __init__(self):
         self.base_url = "https://comunicaapi.pje.jus.br/api/v1/comunicacao"
         self.all_publications = []
-        
-    def search_with_params(self, params: Dict[str, Any], progress_callback=None) -> List[Dict]:
-        """Executa busca com parâmetros específicos"""
+        # Itens por página e quantidade de páginas buscadas em paralelo por regra
+        self.page_size = 50
+        self.page_window = 4
+        
+        # Sessão persistente: reaproveita conexões TCP/TLS entre páginas e regras
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            # Rate limit (429): respeita Retry-After e espera cada vez mais antes de desistir
+            max_retries=Retry(total=5, backoff_factor=2, status_forcelist=[429, 502, 503])
+        ))
+        
+    def search_with_params(self, params: Dict[str, Any], progress_callback=None,
+                           stop_event: Optional[threading.Event] = None) -> List[Dict]:
+        """Executa busca com parâmetros específicos.
+        
+        Levanta RuntimeError se alguma página falhar, para que um resultado parcial
+        não seja confundido com o fim da paginação.
+        """
         publications = []
-        search_params = params.copy()
-        search_params.update({
-            "itensPorPagina": 50,
-            "pagina": 1
-        })
+        search_params = {k: v for k, v in params.items() if k != '_rule_name'}
+        search_params["itensPorPagina"] = self.page_size
+        # Query string montada uma única vez; ordenada para servir de chave estável do cache
+        query_url = f"{self.base_url}?{urlencode(sorted(search_params.items()))}"
         
         rule_name = params.get('_rule_name', 'Busca')
         
-        while True:
-            if progress_callback:
-                progress_callback(f"Executando {rule_name} - Página {search_params['pagina']}")
-            
-            try:
-                response = requests.get(self.base_url, params=search_params, timeout=30)
+        page = 1
+        # A primeira página vai sozinha; só depois de uma página cheia vale buscar uma janela
+        window_size = 1
+        last_page_reached = False
+        
+        with ThreadPoolExecutor(
+            max_workers=self.page_window,
+            initializer=add_script_run_ctx,
+            initargs=(None, get_script_run_ctx())
+        ) as executor:
+            while not last_page_reached:
+                # Busca interrompida: o resultado não será mais utilizado
+                if stop_event and stop_event.is_set():
+                    break
+                
+                # Busca antecipada: uma janela de páginas fica em andamento simultaneamente
+                window = range(page, page + window_size)
+                futures = [executor.submit(_fetch_page, self.session, query_url, p) for p in window]
                 
-                if response.status_code == 200:
-                    dados = response.json()
-                    items = dados.get("items", [])
+                for current_page, future in zip(window, futures):
+                    if progress_callback:
+                        progress_callback(f"Executando {rule_name} - Página {current_page}")
                     
-                    if not items:
-                        break
+                    try:
+                        items = future.result()
+                    except Exception as e:
+                        for pending in futures:
+                            pending.cancel()
+                        if isinstance(e, requests.HTTPError):
+                            raise RuntimeError(f"Erro na busca {rule_name}: {e.response.status_code}") from e
+                        raise RuntimeError(f"Erro na requisição {rule_name}: {str(e)}") from e
                     
                     publications.extend(items)
-                    search_params["pagina"] += 1
-                    time.sleep(0.5)  # Rate limiting
                     
-                elif response.status_code == 429:
-                    if progress_callback:
-                        progress_callback("Rate limit atingido. Aguardando...")
-                    time.sleep(10)
-                else:
-                    st.error(f"Erro na busca {rule_name}: {response.status_code}")
-                    break
-                    
-            except Exception as e:
-                st.error(f"Erro na requisição {rule_name}: {str(e)}")
-                break
+                    if len(items) < self.page_size:
+                        # Página incompleta é a última: descarta as páginas especulativas pendentes
+                        for pending in futures:
+                            pending.cancel()
+                        last_page_reached = True
+                        break
+                
+                page += window_size
+                window_size = self.page_window
                 
         return publications
     
+    def _search_keys(self, params: Dict[str, Any], progress_callback=None,
+                     stop_event: Optional[threading.Event] = None) -> Set[str]:
+        """Executa busca retornando apenas as chaves das publicações encontradas"""
+        return {_publication_key(pub) for pub in self.search_with_params(params, progress_callback, stop_event)}
+    
     def execute_rules(self, rules: List[SearchRule], progress_callback=None) -> List[Dict]:
         """Executa todas as regras e combina os resultados"""
-        include_publications = []
-        exclude_publications = []
+        # Inclusões indexadas pela chave de comparação, o que também remove duplicatas
+        include_by_key = {}
+        exclude_hashes = set()
+        # Uma regra E esvaziou o acumulado: daí em diante só regras OU podem acrescentar
+        intersection_emptied = False
+        
+        enabled_rules = [rule for rule in rules if rule.enabled]
+        
+        # Para cada posição, indica se ainda há regra OU depois dela
+        or_rule_after = [False] * len(enabled_rules)
+        for i in range(len(enabled_rules) - 2, -1, -1):
+            next_rule = enabled_rules[i + 1]
+            or_rule_after[i] = or_rule_after[i + 1] or (
+                next_rule.rule_type == RuleType.INCLUDE and next_rule.operator == RuleOperator.OR
+            )
         
-        for rule in rules:
-            if not rule.enabled:
-                continue
+        futures = []
+        stop_event = threading.Event()
+        
+        # Dispara as regras em paralelo; as threads herdam o contexto do Streamlit
+        # para que progress_callback continue funcionando
+        with ThreadPoolExecutor(
+            max_workers=8,
+            initializer=add_script_run_ctx,
+            initargs=(None, get_script_run_ctx())
+        ) as executor:
+            for rule in enabled_rules:
+                if progress_callback:
+                    progress_callback(f"Executando regra: {rule.name}")
                 
-            if progress_callback:
-                progress_callback(f"Executando regra: {rule.name}")
-            
-            # Adiciona identificador da regra nos parâmetros
-            rule_params = rule.parameters.copy()
-            rule_params['_rule_name'] = rule.name
-            
-            publications = self.search_with_params(rule_params, progress_callback)
-            
-            if rule.rule_type == RuleType.INCLUDE:
-                if rule.operator == RuleOperator.OR:
-                    include_publications.extend(publications)
-                else:  # AND
-                    if not include_publications:
-                        include_publications = publications
-                    else:
-                        # Intersecção baseada em hash
-                        include_hashes = {pub.get('hash', pub.get('id', '')) for pub in include_publications}
-                        publications_hashes = {pub.get('hash', pub.get('id', '')) for pub in publications}
-                        common_hashes = include_hashes.intersection(publications_hashes)
-                        include_publications = [pub for pub in include_publications 
-                                              if pub.get('hash', pub.get('id', '')) in common_hashes]
+                # Adiciona identificador da regra nos parâmetros
+                rule_params = rule.parameters.copy()
+                rule_params['_rule_name'] = rule.name
+                
+                # Regras de exclusão devolvem só as chaves, liberando as publicações ainda na thread
+                task = self._search_keys if rule.rule_type == RuleType.EXCLUDE else self.search_with_params
+                futures.append(executor.submit(task, rule_params, progress_callback, stop_event))
             
-            elif rule.rule_type == RuleType.EXCLUDE:
-                exclude_publications.extend(publications)
-        
-        # Remove duplicatas das inclusões
-        if progress_callback:
-            progress_callback("Removendo duplicatas das inclusões...")
-        include_publications = self.remove_duplicates(include_publications)
-        
-        # Remove as exclusões
-        if exclude_publications:
+            # Combina os resultados na ordem das regras, à medida que ficam prontos:
+            # OU acrescenta ao acumulado e E intersecta com ele (ou o inicia, se estiver vazio)
+            combined = 0
+            try:
+                for _ in as_completed(futures):
+                    while combined < len(futures) and futures[combined].done():
+                        rule = enabled_rules[combined]
+                        result = futures[combined].result()
+                        
+                        if rule.rule_type == RuleType.EXCLUDE:
+                            exclude_hashes.update(result)
+                        elif rule.operator == RuleOperator.OR:
+                            for pub in result:
+                                include_by_key.setdefault(_publication_key(pub), pub)
+                        elif not include_by_key and not intersection_emptied:  # AND
+                            include_by_key = _index_publications(result)
+                        elif include_by_key:  # AND
+                            rule_keys = {_publication_key(pub) for pub in result}
+                            include_by_key = {key: pub for key, pub in include_by_key.items() if key in rule_keys}
+                            intersection_emptied = not include_by_key
+                        
+                        # Interseção vazia sem regras OU adiante: o resultado final é vazio
+                        if intersection_emptied and not include_by_key and not or_rule_after[combined]:
+                            stop_event.set()
+                            for pending in futures:
+                                pending.cancel()
+                            return []
+                        
+                        combined += 1
+            except Exception:
+                # Falha em uma regra invalida a busca inteira: interrompe as demais e propaga o erro
+                stop_event.set()
+                for pending in futures:
+                    pending.cancel()
+                raise
+        
+        # Remove as exclusões, tocando apenas as chaves excluídas
+        if exclude_hashes:
             if progress_callback:
                 progress_callback("Aplicando exclusões...")
-            exclude_hashes = {pub.get('hash', pub.get('id', '')) for pub in exclude_publications}
-            final_publications = [pub for pub in include_publications 
-                                if pub.get('hash', pub.get('id', '')) not in exclude_hashes]
-        else:
-            final_publications = include_publications
+            for pub_hash in exclude_hashes:
+                include_by_key.pop(pub_hash, None)
         
-        return final_publications
+        return list(include_by_key.values())
+
+@st.cache_resource
+def get_searcher() -> EnhancedDJESearcher:
+    """Searcher compartilhado entre reruns, preservando o pool de conexões da sessão"""
+    return EnhancedDJESearcher()
+
+@lru_cache(maxsize=256)
+def _parse_iso(value: str) -> date:
+    """Converte uma data no formato AAAA-MM-DD.
     
-    def remove_duplicates(self, publications: List[Dict]) -> List[Dict]:
-        """Remove duplicatas baseado no hash da publicação"""
-        seen_hashes = set()
-        unique_publications = []
-        
-        for pub in publications:
-            pub_hash = pub.get('hash')
-            if pub_hash and pub_hash not in seen_hashes:
-                seen_hashes.add(pub_hash)
-                unique_publications.append(pub)
-            elif not pub_hash:
-                # Para publicações sem hash, usar outros campos para identificar duplicatas
-                unique_id = f"{pub.get('id', '')}_{pub.get('numeroprocessocommascara', '')}"
-                if unique_id not in seen_hashes:
-                    seen_hashes.add(unique_id)
-                    unique_publications.append(pub)
-        
-        return unique_publications
+    O cache vale dentro de uma renderização (as regras compartilham datas); como o
+    Streamlit reexecuta o app.py a cada rerun, ele não persiste entre reruns.
+    """
+    return datetime.strptime(value, '%Y-%m-%d').date()
 
 def create_rule_form(rule_index: int, existing_rule: Optional[SearchRule] = None) -> Optional[SearchRule]:
     """Cria formulário para configurar uma regra"""
@@ -250,7 +370,7 @@ def create_rule_form(rule_index: int, existing_rule: Optional[SearchRule] = None
             rule_type = st.selectbox(
                 "Tipo de Regra",
                 options=rule_type_options,
-                format_func=lambda x: "Incluir" if x == RuleType.INCLUDE else "Excluir",
+                format_func=_rule_type_fmt,
                 index=default_index,
                 key=f"{prefix}_type"
             )
@@ -270,7 +390,7 @@ def create_rule_form(rule_index: int, existing_rule: Optional[SearchRule] = None
             rule_operator = st.selectbox(
                 "Operador (para regras do tipo Incluir)",
                 options=operator_options,
-                format_func=lambda x: "OU (união)" if x == RuleOperator.OR else "E (interseção)",
+                format_func=_rule_operator_fmt,
                 index=operator_index,
                 key=f"{prefix}_operator",
                 disabled=rule_type == RuleType.EXCLUDE
@@ -295,17 +415,16 @@ def create_rule_form(rule_index: int, existing_rule: Optional[SearchRule] = None
                 key=f"{prefix}_numero_oab"
             )
             
-            uf_options = [""] + ["AC", "AL", "AP", "AM", "BA", "CE", "DF", "ES", "GO", "MA", "MT", "MS", "MG", "PA", "PB", "PR", "PE", "PI", "RJ", "RN", "RS", "RO", "RR", "SC", "SP", "SE", "TO"]
             uf_default = 0
             if existing_rule and existing_rule.parameters.get('ufOab'):
                 try:
-                    uf_default = uf_options.index(existing_rule.parameters.get('ufOab'))
+                    uf_default = UF_OPTIONS.index(existing_rule.parameters.get('ufOab'))
                 except ValueError:
                     uf_default = 0
             
             uf_oab = st.selectbox(
                 "UF da OAB",
-                options=uf_options,
+                options=UF_OPTIONS,
                 index=uf_default,
                 key=f"{prefix}_uf_oab"
             )
@@ -359,7 +478,7 @@ def create_rule_form(rule_index: int, existing_rule: Optional[SearchRule] = None
             default_start_date = date(2025, 7, 7)
             if existing_rule and existing_rule.parameters.get('dataDisponibilizacaoInicio'):
                 try:
-                    default_start_date = datetime.strptime(existing_rule.parameters.get('dataDisponibilizacaoInicio'), '%Y-%m-%d').date()
+                    default_start_date = _parse_iso(existing_rule.parameters.get('dataDisponibilizacaoInicio'))
                 except ValueError:
                     default_start_date = date(2025, 7, 7)
             
@@ -373,7 +492,7 @@ def create_rule_form(rule_index: int, existing_rule: Optional[SearchRule] = None
             default_end_date = None
             if existing_rule and existing_rule.parameters.get('dataDisponibilizacaoFim'):
                 try:
-                    default_end_date = datetime.strptime(existing_rule.parameters.get('dataDisponibilizacaoFim'), '%Y-%m-%d').date()
+                    default_end_date = _parse_iso(existing_rule.parameters.get('dataDisponibilizacaoFim'))
                 except ValueError:
                     default_end_date = None
             
@@ -418,59 +537,64 @@ def create_rule_form(rule_index: int, existing_rule: Optional[SearchRule] = None
         
         return None
 
+def _esc(value: Any) -> str:
+    """Escapa um campo da API antes de inseri-lo no HTML do card"""
+    return html.escape(str(value))
+
 def display_publication_card(pub: Dict, index: int):
     """Exibe uma publicação como card"""
+    # Monta todo o HTML do card para enviá-lo em uma única chamada ao Streamlit
+    parts: List[str] = [
+        '<div class="publication-card">',
+        f'<div class="publication-title">{_esc(pub.get("tipoComunicacao", "N/A"))} - {_esc(pub.get("siglaTribunal", "N/A"))}</div>',
+        f'<div class="publication-info">📅 <strong>Data:</strong> {_esc(pub.get("datadisponibilizacao", "N/A"))} | '
+        f'🏛️ <strong>Órgão:</strong> {_esc(pub.get("nomeOrgao", "N/A"))}</div>',
+        f'<div class="publication-info">📋 <strong>Processo:</strong> {_esc(pub.get("numeroprocessocommascara", "N/A"))} | '
+        f'📝 <strong>Classe:</strong> {_esc(pub.get("nomeClasse", "N/A"))}</div>',
+    ]
+    
+    # Texto da publicação (textos longos ficam em um expander, fora do card)
+    texto = pub.get('texto', 'Texto não disponível')
+    long_text = len(texto) > 500
+    if not long_text:
+        parts.append(f'<div class="publication-text">{texto}</div>')
+    
+    # Destinatários
+    destinatarios = pub.get('destinatarios', [])
+    if destinatarios:
+        parts.append('<p><strong>👥 Destinatários:</strong></p>')
+        parts.append("<ul>" + "".join(
+            f"<li>{_esc(dest.get('nome', 'N/A'))} ({_esc(dest.get('polo', 'N/A'))})</li>" for dest in destinatarios
+        ) + "</ul>")
+    
+    # Advogados
+    advogados = pub.get('destinatarioadvogados', [])
+    if advogados:
+        parts.append('<p><strong>⚖️ Advogados:</strong></p>')
+        for adv_info in advogados:
+            adv = adv_info.get('advogado', {})
+            parts.append(
+                f'<div class="lawyer-info"><strong>{_esc(adv.get("nome", "N/A"))}</strong><br>'
+                f'OAB: {_esc(adv.get("numero_oab", "N/A"))}/{_esc(adv.get("uf_oab", "N/A"))}</div>'
+            )
+    
+    # Link para o processo
+    link = pub.get('link', '')
+    # Apenas links http(s): esquemas como javascript: não entram no href
+    if isinstance(link, str) and link.startswith(('http://', 'https://')):
+        parts.append(f'<p><a href="{html.escape(link, quote=True)}" target="_blank">🔗 Acessar processo</a></p>')
+    
+    parts.append("</div>")
+    if not long_text:
+        parts.append("<hr>")
+    
     with st.container():
-        st.markdown(f"""
-        <div class="publication-card">
-            <div class="publication-title">
-                {pub.get('tipoComunicacao', 'N/A')} - {pub.get('siglaTribunal', 'N/A')}
-            </div>
-            <div class="publication-info">
-                📅 <strong>Data:</strong> {pub.get('datadisponibilizacao', 'N/A')} | 
-                🏛️ <strong>Órgão:</strong> {pub.get('nomeOrgao', 'N/A')}
-            </div>
-            <div class="publication-info">
-                📋 <strong>Processo:</strong> {pub.get('numeroprocessocommascara', 'N/A')} | 
-                📝 <strong>Classe:</strong> {pub.get('nomeClasse', 'N/A')}
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown("".join(parts), unsafe_allow_html=True)
         
-        # Texto da publicação
-        texto = pub.get('texto', 'Texto não disponível')
-        if len(texto) > 500:
+        if long_text:
             with st.expander("📄 Ver texto completo"):
                 st.markdown(f'<div class="publication-text">{texto}</div>', unsafe_allow_html=True)
-        else:
-            st.markdown(f'<div class="publication-text">{texto}</div>', unsafe_allow_html=True)
-        
-        # Destinatários
-        destinatarios = pub.get('destinatarios', [])
-        if destinatarios:
-            st.markdown("**👥 Destinatários:**")
-            for dest in destinatarios:
-                st.markdown(f"- {dest.get('nome', 'N/A')} ({dest.get('polo', 'N/A')})")
-        
-        # Advogados
-        advogados = pub.get('destinatarioadvogados', [])
-        if advogados:
-            st.markdown("**⚖️ Advogados:**")
-            for adv_info in advogados:
-                adv = adv_info.get('advogado', {})
-                st.markdown(f"""
-                <div class="lawyer-info">
-                    <strong>{adv.get('nome', 'N/A')}</strong><br>
-                    OAB: {adv.get('numero_oab', 'N/A')}/{adv.get('uf_oab', 'N/A')}
-                </div>
-                """, unsafe_allow_html=True)
-        
-        # Link para o processo
-        link = pub.get('link', '')
-        if link:
-            st.markdown(f"[🔗 Acessar processo]({link})")
-        
-        st.markdown("</div>", unsafe_allow_html=True)
-        st.markdown("---")
+            st.markdown("---")
 
 def display_rule_summary(rules: List[SearchRule]):
     """Exibe resumo das regras configuradas"""
@@ -524,6 +648,10 @@ def main():
                 st.session_state.template_loaded = False
                 st.rerun()
         
+        if st.button("🧹 Limpar cache"):
+            st.cache_data.clear()
+            st.success("Cache de buscas limpo!")
+        
         # Templates de regras
         st.markdown("### 📋 Templates de Regras")
         if st.button("📋 Carregar Template Padrão"):
@@ -612,7 +740,7 @@ def main():
         
         # Botão de busca
         if st.button("🔍 Executar Busca", type="primary"):
-            searcher = EnhancedDJESearcher()
+            searcher = get_searcher()
             
             # Progress bar e status
             progress_bar = st.progress(0)
@@ -630,6 +758,15 @@ def main():
                 
                 # Armazena os resultados na sessão
                 st.session_state.publications = publications
+                # Colunas usadas nos filtros, em um DataFrame para filtragem vetorizada
+                df = pd.DataFrame(
+                    publications, columns=['siglaTribunal', 'tipoComunicacao', 'nomeClasse']
+                ).fillna('N/A')
+                st.session_state.publications_df = df
+                # Opções dos filtros calculadas uma vez por busca, não a cada rerun
+                st.session_state.filter_options = {
+                    column: ["Todos"] + sorted(df[column].unique().tolist()) for column in df.columns
+                }
                 st.session_state.search_completed = True
                 
             except Exception as e:
@@ -639,36 +776,43 @@ def main():
     # Exibe os resultados se existirem
     if hasattr(st.session_state, 'publications') and st.session_state.publications:
         publications = st.session_state.publications
+        df = st.session_state.publications_df
         
         # Filtros
         st.markdown("## 🔍 Filtros dos Resultados")
         col1, col2, col3 = st.columns(3)
         
+        filter_options = st.session_state.filter_options
+        
         with col1:
-            tribunais = sorted(list(set([pub.get('siglaTribunal', 'N/A') for pub in publications])))
-            tribunal_filter = st.selectbox("Tribunal", ["Todos"] + tribunais)
+            tribunal_filter = st.selectbox("Tribunal", filter_options['siglaTribunal'])
         
         with col2:
-            tipos = sorted(list(set([pub.get('tipoComunicacao', 'N/A') for pub in publications])))
-            tipo_filter = st.selectbox("Tipo de Comunicação", ["Todos"] + tipos)
+            tipo_filter = st.selectbox("Tipo de Comunicação", filter_options['tipoComunicacao'])
         
         with col3:
-            classes = sorted(list(set([pub.get('nomeClasse', 'N/A') for pub in publications])))
-            classe_filter = st.selectbox("Classe Processual", ["Todos"] + classes)
-        
-        # Aplicar filtros
-        filtered_publications = publications
-        if tribunal_filter != "Todos":
-            filtered_publications = [pub for pub in filtered_publications if pub.get('siglaTribunal') == tribunal_filter]
-        if tipo_filter != "Todos":
-            filtered_publications = [pub for pub in filtered_publications if pub.get('tipoComunicacao') == tipo_filter]
-        if classe_filter != "Todos":
-            filtered_publications = [pub for pub in filtered_publications if pub.get('nomeClasse') == classe_filter]
+            classe_filter = st.selectbox("Classe Processual", filter_options['nomeClasse'])
+        
+        # Aplicar filtros em uma única comparação vetorizada, ignorando os não selecionados
+        selected_filters = {
+            column: value for column, value in (
+                ('siglaTribunal', tribunal_filter),
+                ('tipoComunicacao', tipo_filter),
+                ('nomeClasse', classe_filter),
+            ) if value != "Todos"
+        }
+        # Mantém apenas os índices filtrados; as publicações são materializadas
+        # somente para a página exibida e para a exportação
+        if selected_filters:
+            mask = (df[list(selected_filters)] == pd.Series(selected_filters)).all(axis=1)
+            filtered_idx = df.index[mask]
+        else:
+            filtered_idx = df.index
         
         # Paginação
         st.markdown("## 📋 Resultados")
         items_per_page = 10
-        total_items = len(filtered_publications)
+        total_items = len(filtered_idx)
         total_pages = math.ceil(total_items / items_per_page)
         
         if total_pages > 1:
@@ -681,7 +825,7 @@ def main():
         # Exibe informações da paginação
         start_idx = (page - 1) * items_per_page
         end_idx = start_idx + items_per_page
-        current_items = filtered_publications[start_idx:end_idx]
+        current_items = [publications[i] for i in filtered_idx[start_idx:end_idx]]
         
         st.info(f"Mostrando {len(current_items)} de {total_items} publicações (Página {page} de {total_pages})")
         
@@ -691,13 +835,14 @@ def main():
         
         # Exportar resultados
         st.markdown("## 📊 Exportar Resultados")
-        if st.button("📋 Exportar como JSON"):
-            json_data = json.dumps(filtered_publications, indent=2, ensure_ascii=False)
+        if st.button("📋 Exportar como NDJSON"):
+            # Uma publicação por linha, serializada direto para bytes
+            payload = b"\n".join(orjson.dumps(publications[i]) for i in filtered_idx)
             st.download_button(
-                label="💾 Baixar JSON",
-                data=json_data,
-                file_name=f"dje_search_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                mime="application/json"
+                label="💾 Baixar NDJSON",
+                data=payload,
+                file_name=f"dje_search_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson",
+                mime="application/x-ndjson"
             )
     
     elif hasattr(st.session_state, 'search_completed') and st.session_state.search_completed: